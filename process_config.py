@@ -12,19 +12,103 @@ import re
 import subprocess
 import sys
 import tempfile
+import threading
+import urllib.parse
 
+from concurrent.futures import ThreadPoolExecutor
 from functools import cache
-from typing import Any, Dict, Literal, Optional, Tuple, Union
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import urllib3
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 HashAlgorithm = Literal["blake3", "sha256"]
 ArtifactFormat = Literal["gz", "tar", "tar.gz", "tar.zst", "zst", "tar.xz", "xz", "zip"]
 
+# Used to infer the artifact format from an asset name. Order matters: compound
+# suffixes such as ".tar.gz" must be checked before ".gz".
+_SUFFIX_TO_ARTIFACT_FORMAT: Tuple[Tuple[str, ArtifactFormat], ...] = (
+    (".tar.gz", "tar.gz"),
+    (".tgz", "tar.gz"),
+    (".tar.zst", "tar.zst"),
+    (".tzst", "tar.zst"),
+    (".tar.xz", "tar.xz"),
+    (".tar", "tar"),
+    (".gz", "gz"),
+    (".zst", "zst"),
+    (".xz", "xz"),
+    (".zip", "zip"),
+)
+
 # Recognized properties in the JSON config.
 OUTPUTS_PARAM = "outputs"
 EXCLUDE_HTTP_PROVIDER_PARAM = "exclude-http-provider"
 EXCLUDE_GITHUB_PROVIDER_PARAM = "exclude-github-release-provider"
 
+_IS_WINDOWS = sys.platform.startswith("win")
+
+# Hashers are much faster when fed large blocks rather than many small ones.
+_READ_BUFFER_SIZE = 1 << 20
+
+
+def _json_write(f: BinaryIO, obj: Any) -> None:
+    """Like _json_dumps() (including its caveat about non-ASCII characters),
+    but writes the UTF-8 encoded JSON to f. orjson produces bytes directly;
+    the stdlib encoder is streamed piece by piece rather than building the
+    whole string in memory."""
+    if orjson is not None:
+        f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+        return
+    for chunk in json.JSONEncoder(indent=2).iterencode(obj):
+        f.write(chunk.encode("utf-8"))
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serializes obj as JSON indented by two spaces, using orjson when it is
+    available because it is considerably faster.
+
+    The output is always valid JSON, but it is not byte-identical across the
+    two code paths: orjson writes non-ASCII characters as raw UTF-8 whereas
+    json.dumps() escapes them as \\uXXXX.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, indent=2)
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parses JSON directly from bytes, using orjson when it is available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class _LazyJson:
+    """Wraps a value that is logged as JSON so it is only serialized if the
+    log record is actually emitted, e.g., logging.info("%s", _LazyJson(x))."""
+
+    def __init__(self, obj: Any) -> None:
+        self.obj = obj
+
+    def __str__(self) -> str:
+        return _json_dumps(self.obj)
+
 
 def main() -> None:
     exit_code = _main()
@@ -54,27 +138,29 @@ def _main() -> int:
     github_server_url = args.server
     api_server_url = args.api_server
     gh_repo_arg = f"{github_server_url}/{repo}"
+    github_host = get_hostname(github_server_url)
 
     if args.local_config:
         print(args.config)
-        with open(args.config, "r") as f:
-            config = json.load(f)
+        with open(args.config, "rb") as f:
+            config = _json_loads(f.read())
     else:
         config = get_config(
             path_to_config=args.config,
             config_ref=args.config_ref,
             github_repository=repo,
             api_url=api_server_url,
+            github_host=github_host,
         )
     if not isinstance(config, dict):
         logging.error(f"config should be a dict, but was:")
-        logging.error(json.dumps(config, indent=2))
+        logging.error(_json_dumps(config))
         return 1
 
     outputs = config.get(OUTPUTS_PARAM)
     if not outputs:
         logging.error(f"no {OUTPUTS_PARAM} specified in config:")
-        logging.error(json.dumps(config, indent=2))
+        logging.error(_json_dumps(config))
         return 1
 
     exclude_http_provider = config.get(EXCLUDE_HTTP_PROVIDER_PARAM, False)
@@ -91,38 +177,48 @@ def _main() -> int:
         return 1
 
     logging.info("using config:")
-    logging.info(json.dumps(config, indent=2))
+    logging.info("%s", _LazyJson(config))
 
-    name_to_asset = get_release_assets(tag=tag, github_repository=repo)
-    logging.info(json.dumps(name_to_asset, indent=2))
+    name_to_asset = get_release_assets(
+        tag=tag,
+        github_repository=repo,
+        api_url=api_server_url,
+        github_host=github_host,
+    )
+    logging.info("%s", _LazyJson(name_to_asset))
 
+    # Mapping platforms to assets is cheap, so do it for every output up front
+    # to fail before anything is downloaded or uploaded.
+    output_to_platform_entries = {}
     for output_filename, output_config in outputs.items():
         platform_entries = map_platforms(output_config, name_to_asset)
         if not isinstance(platform_entries, dict):
             logging.error(f"failed with error type {platform_entries}")
             return 1
 
-        logging.info(json.dumps(platform_entries, indent=2))
+        logging.info("%s", _LazyJson(platform_entries))
+        output_to_platform_entries[output_filename] = platform_entries
+
+    # Assets are downloaded into a single directory for the whole run so that
+    # an asset shared by several platforms or outputs is only fetched once.
+    with tempfile.TemporaryDirectory(prefix="dotslash_assets_") as temp_dir:
+        digests = compute_digests(
+            output_to_platform_entries, gh_repo_arg, tag, temp_dir
+        )
 
-        manifest_file_contents = generate_manifest_file(
+    for output_filename, platform_entries in output_to_platform_entries.items():
+        output_file = _process_output(
             output_filename,
-            gh_repo_arg,
-            tag,
             platform_entries,
+            digests=digests,
+            gh_repo_arg=gh_repo_arg,
+            tag=tag,
+            output_folder=output_folder,
             include_http_provider=not exclude_http_provider,
             include_github_release_provider=not exclude_github_release_provider,
         )
-        logging.info(manifest_file_contents)
-
-        output_file = os.path.join(output_folder, output_filename)
-        with open(output_file, "w") as f:
-            f.write(manifest_file_contents)
-
-            # `chmod +x` if not on Windows.
-            if not sys.platform.startswith('win'):
-                fd = f.fileno()
-                os.fchmod(fd, 0o755)
-        logging.info(f"wrote manifest to {output_file}")
+        if not isinstance(output_file, str):
+            return 1
 
         if args.upload:
             # Upload manifest to release, but do not clobber. Note that this may
@@ -143,92 +239,173 @@ def _main() -> int:
     return 0
 
 
-def generate_manifest_file(
+def compute_digests(
+    output_to_platform_entries: Dict[str, Dict[str, Tuple[Any, Any]]],
+    gh_repo_arg: str,
+    tag: str,
+    temp_dir: str,
+) -> Dict[Tuple[str, HashAlgorithm], str]:
+    """Computes the digest of every distinct (asset name, hash algorithm) pair
+    referenced by the outputs. Downloads are network-bound, so the pairs are
+    hashed concurrently.
+    """
+    to_hash: Dict[Tuple[str, HashAlgorithm], Any] = {}
+    for platform_entries in output_to_platform_entries.values():
+        for asset, platform_config in platform_entries.values():
+            name = asset.get("name")
+            if name is None or asset.get("size") is None:
+                # Reported by generate_manifest().
+                continue
+            to_hash[(name, platform_config.get("hash", "blake3"))] = asset
+
+    if not to_hash:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(8, len(to_hash))) as executor:
+        futures = {
+            (name, hash_algo): executor.submit(
+                compute_hash,
+                gh_repo_arg,
+                temp_dir,
+                tag,
+                name,
+                hash_algo,
+                asset["size"],
+                download_url=asset.get("apiUrl"),
+            )
+            for (name, hash_algo), asset in to_hash.items()
+        }
+    return {key: future.result() for key, future in futures.items()}
+
+
+def _process_output(
+    output_filename: str,
+    platform_entries: Dict[str, Tuple[Any, Any]],
+    *,
+    digests: Dict[Tuple[str, HashAlgorithm], str],
+    gh_repo_arg: str,
+    tag: str,
+    output_folder: str,
+    include_http_provider: bool,
+    include_github_release_provider: bool,
+) -> Union[str, int]:
+    """Generates and writes the DotSlash file for a single entry in
+    `outputs`.
+
+    Returns the path to the DotSlash file on success or a non-zero exit code
+    on failure.
+    """
+    manifest = generate_manifest(
+        output_filename,
+        gh_repo_arg,
+        tag,
+        platform_entries,
+        digests=digests,
+        include_http_provider=include_http_provider,
+        include_github_release_provider=include_github_release_provider,
+    )
+    if not isinstance(manifest, dict):
+        return manifest
+
+    output_file = os.path.join(output_folder, output_filename)
+    with open(output_file, "wb") as f:
+        # `chmod +x` if not on Windows.
+        if not _IS_WINDOWS:
+            os.fchmod(f.fileno(), 0o755)
+        write_manifest_file(f, manifest)
+    logging.info(
+        f"wrote manifest for {output_filename} with {len(manifest['platforms'])} platform(s) to {output_file}"
+    )
+    return output_file
+
+
+def generate_manifest(
     name: str,
     gh_repo_arg: str,
     tag: str,
     platform_entries,
+    digests: Dict[Tuple[str, HashAlgorithm], str],
     include_http_provider: bool,
     include_github_release_provider: bool,
-) -> str:
+) -> Union[Dict[str, Any], int]:
+    """Returns the manifest as a dict, or a non-zero exit code if the config
+    for one of the platforms is invalid."""
     platforms = {}
-    with tempfile.TemporaryDirectory() as temp_dir:
-        for platform_name, platform_entry in platform_entries.items():
-            asset, platform_config = platform_entry
-            hash_algo = platform_config.get("hash", "blake3")
-            size = asset.get("size")
-            if size is None:
-                logging.error(f"missing 'size' field in asset: {asset}")
-                return 1
+    for platform_name, platform_entry in platform_entries.items():
+        asset, platform_config = platform_entry
+        hash_algo = platform_config.get("hash", "blake3")
+        size = asset.get("size")
+        if size is None:
+            logging.error(f"missing 'size' field in asset: {asset}")
+            return 1
 
-            asset_name = asset.get("name")
-            if asset_name is None:
-                logging.error(f"missing 'name' field in asset: {asset}")
-                return 1
+        asset_name = asset.get("name")
+        if asset_name is None:
+            logging.error(f"missing 'name' field in asset: {asset}")
+            return 1
 
-            path = platform_config.get("path")
-            if not path:
-                logging.error(f"missing `path` field in asset: {asset}")
+        path = platform_config.get("path")
+        if not path:
+            logging.error(f"missing `path` field in asset: {asset}")
+            return 1
+
+        if "format" in platform_config:
+            # If the user is knowingly not using any sort of compression,
+            # then `"format": null` must be explicitly specified in the JSON.
+            asset_format = platform_config["format"]
+        else:
+            asset_format = guess_artifact_format_from_asset_name(asset_name)
+            if not asset_format:
+                logging.error(
+                    f'"format" could not be inferred from asset name: {asset_name} in {asset}, must specify explicitly'
+                )
                 return 1
 
-            if "format" in platform_config:
-                # If the user is knowingly not using any sort of compression,
-                # then `"format": null` must be explicitly specified in the JSON.
-                asset_format = platform_config["format"]
-            else:
-                asset_format = guess_artifact_format_from_asset_name(asset_name)
-                if not asset_format:
-                    logging.error(
-                        f'"format" could not be inferred from asset name: {asset_name} in {asset}, must specify explicitly'
-                    )
-                    return 1
-
-            hash_hex = compute_hash(
-                gh_repo_arg, temp_dir, tag, asset_name, hash_algo, size
-            )
+        hash_hex = digests[(asset_name, hash_algo)]
 
-            providers = []
-            if include_http_provider:
-                providers.append(
-                    {
-                        "url": asset["url"],
-                    }
-                )
-            if include_github_release_provider:
-                providers.append(
-                    {
-                        "type": "github-release",
-                        "repo": gh_repo_arg,
-                        "tag": tag,
-                        "name": asset_name,
-                    }
-                )
+        providers = []
+        if include_http_provider:
+            providers.append(
+                {
+                    "url": asset["url"],
+                }
+            )
+        if include_github_release_provider:
+            providers.append(
+                {
+                    "type": "github-release",
+                    "repo": gh_repo_arg,
+                    "tag": tag,
+                    "name": asset_name,
+                }
+            )
 
-            artifact_entry = {
-                "size": size,
-                "hash": hash_algo,
-                "digest": hash_hex,
-                "format": asset_format,
-                "path": path,
-                "providers": providers,
-            }
-
-            # If `"format": null` was specified, there should not be a "format"
-            # field in the arifact entry.
-            if not asset_format:
-                del artifact_entry["format"]
+        artifact_entry = {
+            "size": size,
+            "hash": hash_algo,
+            "digest": hash_hex,
+        }
+        # If `"format": null` was specified, there should not be a "format"
+        # field in the arifact entry.
+        if asset_format:
+            artifact_entry["format"] = asset_format
+        artifact_entry["path"] = path
+        artifact_entry["providers"] = providers
 
-            platforms[platform_name] = artifact_entry
+        platforms[platform_name] = artifact_entry
 
     manifest = {
         "name": name,
         "platforms": platforms,
     }
 
-    return f"""#!/usr/bin/env dotslash
+    return manifest
+
 
-{json.dumps(manifest, indent=2)}
-"""
+def write_manifest_file(f: BinaryIO, manifest: Dict[str, Any]) -> None:
+    f.write(b"#!/usr/bin/env dotslash\n\n")
+    _json_write(f, manifest)
+    f.write(b"\n")
 
 
 def map_platforms(
@@ -250,6 +427,7 @@ def map_platforms(
         return "ParseError"
 
     platform_entries = {}
+    regex_to_asset: Dict[str, Any] = {}
     for platform, platform_config in platforms.items():
         name = platform_config.get("name")
         name_regex = platform_config.get("regex")
@@ -265,33 +443,69 @@ def map_platforms(
             return "NeitherNameNorRegex"
 
         if name:
-            # Try to match the name exactly:
-            for asset_name, asset in name_to_asset.items():
-                if asset_name == name:
-                    platform_entries[platform] = (asset, platform_config)
-                    break
-            if platform in platform_entries:
-                continue
-            else:
+            asset = name_to_asset.get(name)
+            if asset is None:
                 logging.error(f"could not find asset with name '{name}'")
                 return "NoMatchForAsset"
+            platform_entries[platform] = (asset, platform_config)
         else:
-            # Try to match the name using a regular expression.
-            regex = re.compile(name_regex)
-            for asset_name, asset in name_to_asset.items():
-                if regex.match(asset_name):
-                    platform_entries[platform] = (asset, platform_config)
-                    break
-            if platform in platform_entries:
-                continue
-            else:
-                logging.error(f"could not find asset matching regex '{name_regex}'")
-                return "NoMatchForAsset"
+            # Try to match the name using a regular expression. Platforms
+            # frequently share a regex (e.g., macos-x86_64 and macos-aarch64
+            # pointing at the same universal binary), so each distinct regex is
+            # only compiled and matched against the assets once.
+            #
+            # Note that re.match() only anchors at the start of the asset name,
+            # which existing configs rely on (e.g., "^hermes-cli-darwin-"), so
+            # a regex that should match the entire name must end with "$".
+            asset = regex_to_asset.get(name_regex)
+            if asset is None:
+                regex = re.compile(name_regex)
+                for asset_name, asset in name_to_asset.items():
+                    if regex.match(asset_name):
+                        regex_to_asset[name_regex] = asset
+                        break
+                else:
+                    logging.error(f"could not find asset matching regex '{name_regex}'")
+                    return "NoMatchForAsset"
+            platform_entries[platform] = (asset, platform_config)
 
     return platform_entries
 
 
-@cache
+# Outputs are processed concurrently and several of them may reference the
+# same asset. Results of downloads and hashes are cached here; _cache_lock is
+# only held to read or update these dicts, never while doing the work, so
+# threads working on different assets do not block one another.
+_cache: Dict[Tuple[Any, ...], Any] = {}
+_in_flight: Dict[Tuple[Any, ...], threading.Event] = {}
+_cache_lock = threading.Lock()
+
+
+def _compute_once(key: Tuple[Any, ...], fn: Callable[..., Any], *args: Any) -> Any:
+    """Returns fn(*args), caching the result under key. If another thread is
+    already computing the value for key, waits for it rather than repeating
+    the work. If that thread fails, one of the waiters tries again."""
+    while True:
+        with _cache_lock:
+            if key in _cache:
+                return _cache[key]
+            event = _in_flight.get(key)
+            if event is None:
+                event = _in_flight[key] = threading.Event()
+                break
+        event.wait()
+
+    try:
+        result = fn(*args)
+        with _cache_lock:
+            _cache[key] = result
+        return result
+    finally:
+        with _cache_lock:
+            del _in_flight[key]
+        event.set()
+
+
 def compute_hash(
     gh_repo_arg: str,
     temp_dir: str,
@@ -299,12 +513,152 @@ def compute_hash(
     name: str,
     hash_algo: HashAlgorithm,
     size: int,
+    download_url: Optional[str] = None,
 ) -> str:
     """Fetches the release entry corresponding to the specified (tag, name) tuple,
     fetches the contents, verifies the size matches, and computes the hash.
 
+    If download_url (the API URL for the asset) is specified and a GitHub
+    token is available, the asset is streamed over HTTPS and hashed as it
+    arrives. Otherwise, it is downloaded into temp_dir via the gh CLI.
+
+    Results are cached per (asset, hash algorithm), so an asset is fetched
+    once per hash algorithm no matter how many platforms reference it. When
+    streaming, an asset that is referenced with both blake3 and sha256 is
+    therefore streamed twice. Files fetched with gh are kept in temp_dir and
+    reused, so in that case each asset is downloaded only once.
+
     Return value is a hex string representing the hash.
     """
+    return _compute_once(
+        ("hash", gh_repo_arg, tag, name, hash_algo),
+        _compute_hash,
+        gh_repo_arg,
+        temp_dir,
+        tag,
+        name,
+        hash_algo,
+        size,
+        download_url,
+    )
+
+
+def _compute_hash(
+    gh_repo_arg: str,
+    temp_dir: str,
+    tag: str,
+    name: str,
+    hash_algo: HashAlgorithm,
+    size: int,
+    download_url: Optional[str],
+) -> str:
+    token = get_github_token(get_hostname(gh_repo_arg))
+    if download_url and token:
+        try:
+            return stream_hash(download_url, token, name, hash_algo, size)
+        except GitHubApiError as e:
+            if e.status not in (401, 403, 404):
+                raise
+            logging.warning(
+                f"could not download {name} from {download_url} ({e}), falling back to gh"
+            )
+
+    output_filename = download_asset(gh_repo_arg, temp_dir, tag, name, size)
+    return hash_file(output_filename, hash_algo)
+
+
+def new_hasher(hash_algo: HashAlgorithm):
+    if hash_algo == "blake3":
+        import blake3
+
+        return blake3.blake3(max_threads=blake3.blake3.AUTO)
+    elif hash_algo == "sha256":
+        import hashlib
+
+        return hashlib.sha256()
+    else:
+        raise ValueError(f"unsupported hash algorithm: {hash_algo}")
+
+
+def stream_hash(
+    download_url: str, token: str, name: str, hash_algo: HashAlgorithm, size: int
+) -> str:
+    """Downloads the asset from the GitHub API and hashes it as it arrives
+    rather than writing it to disk and reading it back."""
+    # The API responds with a redirect to a pre-signed URL on another host.
+    # urllib3 strips the Authorization header when following a cross-host
+    # redirect, so the token is not leaked to it.
+    response = github_api_get(
+        download_url, token, accept="application/octet-stream", stream=True
+    )
+    hasher = new_hasher(hash_algo)
+    total = 0
+    try:
+        for chunk in response.stream(_READ_BUFFER_SIZE):
+            hasher.update(chunk)
+            total += len(chunk)
+    finally:
+        response.release_conn()
+    if total != size:
+        raise Exception(f"expected size {size} for {name} but got {total}")
+    return hasher.hexdigest()
+
+
+def _read_chunks(f) -> Iterator[memoryview]:
+    """Yields the contents of the local file f in chunks of up to
+    _READ_BUFFER_SIZE bytes. Each chunk is a view into a single reused buffer,
+    so it is only valid until the next iteration."""
+    buf = memoryview(bytearray(_READ_BUFFER_SIZE))
+    while n := f.readinto(buf):
+        yield buf[:n]
+
+
+def hash_file(filename: str, hash_algo: HashAlgorithm) -> str:
+    if hash_algo == "blake3":
+        import blake3
+
+        # update_mmap() hashes the file in Rust without round-tripping through
+        # Python for each chunk, and AUTO lets it use a thread pool for large
+        # files.
+        hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+        hasher.update_mmap(filename)
+        return hasher.hexdigest()
+    elif hash_algo == "sha256":
+        import hashlib
+
+        with open(filename, "rb") as f:
+            if hasattr(hashlib, "file_digest"):
+                # Python 3.11+
+                return hashlib.file_digest(f, "sha256").hexdigest()
+            hasher = hashlib.sha256()
+            for chunk in _read_chunks(f):
+                hasher.update(chunk)
+            return hasher.hexdigest()
+    else:
+        raise ValueError(f"unsupported hash algorithm: {hash_algo}")
+
+
+def download_asset(
+    gh_repo_arg: str, temp_dir: str, tag: str, name: str, size: int
+) -> str:
+    """Downloads the release asset into temp_dir (if it has not been downloaded
+    already) and returns the path to the local file."""
+    return _compute_once(
+        # temp_dir is part of the key: a cached path is only valid for as
+        # long as the run's temp_dir exists.
+        ("download", gh_repo_arg, temp_dir, tag, name),
+        _download_asset,
+        gh_repo_arg,
+        temp_dir,
+        tag,
+        name,
+        size,
+    )
+
+
+def _download_asset(
+    gh_repo_arg: str, temp_dir: str, tag: str, name: str, size: int
+) -> str:
     output_filename = os.path.join(temp_dir, name)
 
     # Fetch the url using the gh CLI to ensure authentication is handled correctly.
@@ -324,87 +678,195 @@ def compute_hash(
         output_filename,
     ]
     subprocess.run(args, check=True)
-    stats = os.stat(output_filename)
-    if stats.st_size != size:
-        raise Exception(f"expected size {size} for {name} but got {stats.st_size}")
+    actual_size = os.path.getsize(output_filename)
+    if actual_size != size:
+        raise Exception(f"expected size {size} for {name} but got {actual_size}")
+    return output_filename
 
-    if hash_algo == "blake3":
-        import blake3
 
-        hasher = blake3.blake3()
-        with open(output_filename, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hasher.update(chunk)
-        digest = hasher.digest()
-        return digest.hex()
-    elif hash_algo == "sha256":
-        import hashlib
+@cache
+def get_github_token(hostname: str) -> Optional[str]:
+    """Returns the token to use for requests made directly to the GitHub API
+    on hostname, resolving it the same way the gh CLI does: GH_TOKEN and
+    GITHUB_TOKEN only apply to github.com, while GitHub Enterprise Server
+    hosts use GH_ENTERPRISE_TOKEN and GITHUB_ENTERPRISE_TOKEN."""
+    if hostname == "github.com":
+        env_vars = ("GH_TOKEN", "GITHUB_TOKEN")
+    else:
+        env_vars = ("GH_ENTERPRISE_TOKEN", "GITHUB_ENTERPRISE_TOKEN")
+    for var in env_vars:
+        token = os.getenv(var)
+        if token:
+            return token
+    try:
+        token = subprocess.check_output(
+            ["gh", "auth", "token", "--hostname", hostname],
+            stderr=subprocess.DEVNULL,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return token.decode("utf-8").strip() or None
+
+
+class GitHubApiError(Exception):
+    def __init__(self, url: str, status: int) -> None:
+        super().__init__(f"GET {url} failed with HTTP status {status}")
+        self.status = status
+
+
+# A single pool shared by all threads so that requests to the same host reuse
+# the TLS connection rather than spawning a gh process per request.
+_HTTP = urllib3.PoolManager(
+    maxsize=8,
+    headers={
+        "User-Agent": "dotslash-publish-release",
+        "X-GitHub-Api-Version": "2022-11-28",
+    },
+)
+
+
+def github_api_get(
+    url: str,
+    token: str,
+    *,
+    accept: str,
+    fields: Optional[Dict[str, str]] = None,
+    stream: bool = False,
+) -> urllib3.BaseHTTPResponse:
+    """Performs a GET request against the GitHub API using the shared
+    connection pool. If stream is True, the body is not read up front and the
+    caller is responsible for calling release_conn() on the response."""
+    headers = dict(_HTTP.headers)
+    headers["Accept"] = accept
+    headers["Authorization"] = f"Bearer {token}"
+    response = _HTTP.request(
+        "GET", url, fields=fields, headers=headers, preload_content=not stream
+    )
+    if response.status >= 400:
+        response.drain_conn()
+        response.release_conn()
+        raise GitHubApiError(url, response.status)
+    return response
 
-        hasher = hashlib.sha256()
-        with open(output_filename, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hasher.update(chunk)
-        return hasher.hexdigest()
+
+def get_hostname(url: str) -> str:
+    return urllib.parse.urlparse(url).hostname or "github.com"
 
 
 def get_config(
-    *, path_to_config: str, config_ref: str, github_repository: str, api_url: str
+    *,
+    path_to_config: str,
+    config_ref: str,
+    github_repository: str,
+    api_url: str,
+    github_host: str,
 ) -> Any:
+    url = f"{api_url}/repos/{github_repository}/contents/{path_to_config}"
+    token = get_github_token(github_host)
+    if token:
+        try:
+            response = github_api_get(
+                url,
+                token,
+                accept="application/vnd.github.raw",
+                fields={"ref": config_ref},
+            )
+            return _json_loads(response.data)
+        except GitHubApiError as e:
+            if e.status not in (401, 403):
+                raise
+            logging.warning(f"could not fetch config ({e}), falling back to gh")
+
     args = [
         "gh",
         "api",
         "-X",
         "GET",
-        f"{api_url}/repos/{github_repository}/contents/{path_to_config}",
+        url,
         "-H",
         "Accept: application/vnd.github.raw",
         "-f",
         f"ref={config_ref}",
     ]
     output = subprocess.check_output(args)
-    return json.loads(output.decode("utf-8"))
+    return _json_loads(output)
+
+
+def get_release_assets(
+    *, tag: str, github_repository: str, api_url: str, github_host: str
+) -> Dict[str, Any]:
+    """Returns the uploaded assets for the release, keyed by name. Each asset
+    has the same shape as the entries of `gh release view --json assets`."""
+    assets = None
+    token = get_github_token(github_host)
+    if token:
+        assets = _get_release_assets_from_api(
+            tag=tag, github_repository=github_repository, api_url=api_url, token=token
+        )
 
+    if assets is None:
+        args = [
+            "gh",
+            "release",
+            "view",
+            tag,
+            "--repo",
+            github_repository,
+            "--json",
+            "assets",
+        ]
+        output = subprocess.check_output(args)
+        release_data = _json_loads(output)
+        assets = release_data.get("assets")
 
-def get_release_assets(*, tag: str, github_repository) -> Dict[str, Any]:
-    args = [
-        "gh",
-        "release",
-        "view",
-        tag,
-        "--repo",
-        github_repository,
-        "--json",
-        "assets",
-    ]
-    output = subprocess.check_output(args)
-    release_data = json.loads(output.decode("utf-8"))
-    assets = release_data.get("assets")
     if not assets:
         raise Exception(f"no assets found for release '{tag}'")
     return {asset["name"]: asset for asset in assets if asset["state"] == "uploaded"}
 
 
-def guess_artifact_format_from_asset_name(asset_name: str) -> Optional[ArtifactFormat]:
-    if asset_name.endswith(".tar.gz") or asset_name.endswith(".tgz"):
-        return "tar.gz"
-    elif asset_name.endswith(".tar.zst") or asset_name.endswith(".tzst"):
-        return "tar.zst"
-    elif asset_name.endswith(".tar.xz"):
-        return "tar.xz"
-    elif asset_name.endswith(".tar"):
-        return "tar"
-    elif asset_name.endswith(".gz"):
-        return "gz"
-    elif asset_name.endswith(".zst"):
-        return "zst"
-    elif asset_name.endswith(".xz"):
-        return "xz"
-    elif asset_name.endswith(".zip"):
-        return "zip"
-
-    else:
+def _get_release_assets_from_api(
+    *, tag: str, github_repository: str, api_url: str, token: str
+) -> Optional[List[Dict[str, Any]]]:
+    """Returns None if the release could not be looked up with the API, in
+    which case the caller falls back to `gh release view`. This happens when
+    the tag belongs to a draft release (the endpoint only knows about
+    published releases, whereas gh also searches drafts) or when the token is
+    rejected."""
+    quoted_tag = urllib.parse.quote(tag, safe="")
+    try:
+        response = github_api_get(
+            f"{api_url}/repos/{github_repository}/releases/tags/{quoted_tag}",
+            token,
+            accept="application/vnd.github+json",
+        )
+    except GitHubApiError as e:
+        if e.status not in (401, 403, 404):
+            raise
+        logging.info(f"could not look up release '{tag}' ({e}), falling back to gh")
         return None
 
+    release_data = _json_loads(response.data)
+    # Translate the REST API field names to those used by gh.
+    return [
+        {
+            "apiUrl": asset["url"],
+            "contentType": asset.get("content_type"),
+            "label": asset.get("label"),
+            "name": asset["name"],
+            "size": asset.get("size"),
+            "state": asset["state"],
+            "url": asset["browser_download_url"],
+        }
+        for asset in release_data.get("assets", [])
+    ]
+
+
+def guess_artifact_format_from_asset_name(asset_name: str) -> Optional[ArtifactFormat]:
+    for suffix, artifact_format in _SUFFIX_TO_ARTIFACT_FORMAT:
+        if asset_name.endswith(suffix):
+            return artifact_format
+    return None
+
 
 def parse_args():
     parser = argparse.ArgumentParser(